@@ -1,13 +1,26 @@
 import gradio as gr
 import subprocess
+import mmap
 import os
 import tempfile
+from collections import deque
 from pathlib import Path
 
 ROOT = Path(__file__).parent
 WHISPER_BIN = ROOT / "build" / "bin" / "whisper-cli"
 MODEL_PATH  = ROOT / "models" / "ggml-small.bin"
 
+def fast_read_text(path: Path) -> str:
+    """Lecture texte : mmap (zéro-copie via le cache de pages) au-delà de 64 Kio."""
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size < 64 * 1024:
+            data = f.read()
+        else:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+                data = m[:]
+    return data.decode("utf-8", "ignore")
+
 def transcribe(audio_file, language, make_srt):
     if not audio_file:
         return "Aucun fichier audio fourni."
@@ -34,17 +47,21 @@ def transcribe(audio_file, language, make_srt):
         if make_srt:
             cmd += ["-osrt"]
 
-        try:
-            subprocess.run(cmd, check=True, capture_output=True)
-        except subprocess.CalledProcessError as e:
-            return (e.stderr.decode(errors="ignore")
-                    or e.stdout.decode(errors="ignore"))
+        # stderr est lu ligne à ligne (rien n'est bufferisé en entier) ;
+        # on garde juste les dernières lignes pour le rapport d'erreur.
+        p = subprocess.Popen(cmd, stdout=subprocess.DEVNULL,
+                             stderr=subprocess.PIPE, bufsize=1, text=True)
+        tail = deque(maxlen=400)
+        for line in p.stderr:
+            tail.append(line)
+        if p.wait() != 0:
+            return "".join(tail) or "whisper-cli a échoué."
 
         txt_file = base.with_suffix(".txt")
         if not txt_file.exists():
             return "La transcription n'a pas été générée."
 
-        return txt_file.read_text(encoding="utf-8", errors="ignore")
+        return fast_read_text(txt_file)
 
 with gr.Blocks() as demo:
     gr.Markdown("# 🎧 Whisper.cpp WebUI — Model small — Local & rapide")
@@ -1,21 +1,71 @@
 import sys
-import textwrap
+import re
 import gradio as gr
 import subprocess
 import os
+import atexit
+import copy
+import hashlib
+import io
+import wave
+from collections import deque
+import json
+import mmap
+import queue
+import shutil
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from datetime import datetime
 from fpdf import FPDF
 import yt_dlp
-import math
 import shlex
 
+# soundfile permet de lire la durée d'un WAV sans forker ffprobe.
+# On reste tolérant si le paquet n'est pas installé.
+try:
+    import soundfile as sf
+except ImportError:
+    sf = None
+
+# requests sert à parler au whisper-server résident (voir plus bas)
+try:
+    import requests
+except ImportError:
+    requests = None
+
+# reportlab fait la mise en page en une passe (métriques compilées) là où
+# fpdf paie un multi_cell par ligne — environ un ordre de grandeur plus
+# rapide sur les longues transcriptions. Fallback fpdf si absent.
+try:
+    from xml.sax.saxutils import escape as _xml_escape
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.styles import ParagraphStyle
+    from reportlab.lib.units import mm
+    from reportlab.lib.utils import ImageReader
+    from reportlab.pdfbase import pdfmetrics
+    from reportlab.pdfbase.ttfonts import TTFont
+    from reportlab.platypus import Image, Paragraph, SimpleDocTemplate, Spacer
+    HAVE_REPORTLAB = True
+except ImportError:
+    HAVE_REPORTLAB = False
+
 
 ROOT = Path(__file__).parent
 WHISPER_BIN = ROOT / "build" / "bin" / "whisper-cli"
+SERVER_BIN  = ROOT / "build" / "bin" / "whisper-server"
 MODEL_PATH  = ROOT / "models" / "ggml-small.bin"
 OUTPUT_DIR  = ROOT / "outputs"
 OUTPUT_DIR.mkdir(exist_ok=True)
+CACHE_DIR   = OUTPUT_DIR / "cache"
+YT_CACHE_DIR = OUTPUT_DIR / "yt_cache"
+
+# Pool de fond pour les post-traitements purs-Python (PDF, fusions...) :
+# whisper-cli tourne hors process, donc le GIL ne bloque rien ici.
+# 3 workers pour que le PDF et les deux fusions avancent de front.
+_bg_pool = ThreadPoolExecutor(max_workers=3)
 
 
 def log(msg):
@@ -24,23 +74,331 @@ def log(msg):
     sys.stdout.flush()
 
 
-def run_whisper(input_file: Path, language: str, make_srt: bool, make_json: bool, run_id: str, progress=None):
-    run_dir = OUTPUT_DIR / run_id
-    run_dir.mkdir(exist_ok=True)
+class RateLimitedProgress:
+    """
+    Enveloppe un callback gr.Progress : chaque appel est un aller-retour
+    WebSocket vers le navigateur, donc on coalesce à min_interval. Un
+    changement de desc ou une valeur finale passe toujours tout de suite.
+    """
+
+    def __init__(self, progress, min_interval=0.1):
+        self._progress = progress
+        self._min_interval = min_interval
+        self._last_sent = 0.0
+        self._last_desc = None
+
+    def __call__(self, ratio, desc=None):
+        now = time.monotonic()
+        if (desc != self._last_desc
+                or ratio >= 1.0
+                or now - self._last_sent >= self._min_interval):
+            self._progress(ratio, desc=desc)
+            self._last_sent = now
+            self._last_desc = desc
+
+
+# Les builds récents de whisper-cli acceptent l'audio sur stdin (-f -),
+# mais leur texte d'aide ne le mentionne pas : on teste la capacité
+# elle-même, une fois par process, en envoyant un mini WAV silencieux.
+_whisper_stdin_ok = None
+
+
+def whisper_supports_stdin() -> bool:
+    global _whisper_stdin_ok
+    if _whisper_stdin_ok is None:
+        _whisper_stdin_ok = False
+        if WHISPER_BIN.exists() and MODEL_PATH.exists():
+            try:
+                # 0,1 s de silence 16 kHz mono, généré en mémoire
+                buf = io.BytesIO()
+                with wave.open(buf, "wb") as w:
+                    w.setnchannels(1)
+                    w.setsampwidth(2)
+                    w.setframerate(16000)
+                    w.writeframes(b"\x00\x00" * 1600)
+                res = subprocess.run(
+                    [str(WHISPER_BIN), "-m", str(MODEL_PATH), "-f", "-", "-t", "1"],
+                    input=buf.getvalue(),
+                    capture_output=True, timeout=120,
+                )
+                _whisper_stdin_ok = res.returncode == 0
+            except Exception:
+                pass
+        log(f"whisper-cli stdin : {'OK' if _whisper_stdin_ok else 'non supporté'}")
+    return _whisper_stdin_ok
+
+
+# whisper-server résident : le modèle (~500 Mo) n'est chargé qu'une fois
+# au lieu d'une fois par chunk (~1-2 s de cold-start sur N100).
+_server_proc = None
+_server_port = None
+_server_lock = threading.Lock()
+
+
+def ensure_whisper_server():
+    """
+    Démarre (une seule fois) un whisper-server local qui garde le modèle
+    en RAM entre les chunks. Retourne le port, ou None si le binaire
+    n'est pas compilé / ne démarre pas — on retombe alors sur whisper-cli.
+    """
+    global _server_proc, _server_port
+
+    if requests is None or not SERVER_BIN.exists():
+        return None
+
+    with _server_lock:
+        if _server_proc is not None and _server_proc.poll() is None:
+            return _server_port
+
+        # Un port libre choisi par l'OS
+        with socket.socket() as s:
+            s.bind(("127.0.0.1", 0))
+            port = s.getsockname()[1]
+
+        cmd = [
+            str(SERVER_BIN),
+            "-m", str(MODEL_PATH),
+            "--host", "127.0.0.1",
+            "--port", str(port),
+        ]
+        try:
+            proc = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        except OSError:
+            return None
+
+        # On attend que le serveur écoute (chargement du modèle inclus)
+        deadline = time.monotonic() + 60
+        while time.monotonic() < deadline:
+            if proc.poll() is not None:
+                return None
+            try:
+                with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                    break
+            except OSError:
+                time.sleep(0.2)
+        else:
+            proc.kill()
+            return None
+
+        atexit.register(proc.terminate)
+        _server_proc, _server_port = proc, port
+        log(f"whisper-server résident démarré sur le port {port}")
+        return port
+
+
+def _format_srt_time(t: float) -> str:
+    ms = int(round(max(t, 0.0) * 1000))
+    h, ms = divmod(ms, 3600 * 1000)
+    m, ms = divmod(ms, 60 * 1000)
+    s, ms = divmod(ms, 1000)
+    return f"{h:02d}:{m:02d}:{s:02d},{ms:03d}"
+
+
+def transcribe_via_server(port: int, chunk: Path, base: Path, language: str, make_srt: bool, make_json: bool):
+    """
+    POSTe un chunk au whisper-server et écrit les mêmes artefacts
+    .txt/.srt/.json que whisper-cli. Une seule inférence (verbose_json),
+    le SRT est resynthétisé localement depuis les segments.
+    """
+    data = {"response_format": "verbose_json", "temperature": "0.0"}
+    if language and language.strip():
+        data["language"] = language.strip()
+
+    with open(chunk, "rb") as f:
+        r = requests.post(
+            f"http://127.0.0.1:{port}/inference",
+            files={"file": (chunk.name, f, "audio/wav")},
+            data=data,
+            timeout=4 * 3600,
+        )
+    r.raise_for_status()
+    result = r.json()
+
+    text = (result.get("text") or "").strip()
+    base.with_suffix(".txt").write_text(text + "\n", encoding="utf-8")
+
+    segments = result.get("segments") or []
+    if make_srt:
+        lines = []
+        for i, seg in enumerate(segments, start=1):
+            lines.append(str(i))
+            lines.append(f"{_format_srt_time(seg.get('start', 0.0))} --> {_format_srt_time(seg.get('end', 0.0))}")
+            lines.append((seg.get("text") or "").strip())
+            lines.append("")
+        base.with_suffix(".srt").write_text("\n".join(lines), encoding="utf-8")
+
+    if make_json:
+        base.with_suffix(".json").write_text(
+            json.dumps(result, ensure_ascii=False, indent=2), encoding="utf-8"
+        )
+
+
+# Timestamp SRT "HH:MM:SS,mmm" (heures éventuellement > 99)
+_SRT_TIME_RE = re.compile(r"(\d{2,}):(\d{2}):(\d{2}),(\d{3})")
+
+
+def _shift_srt_time(m, offset: float) -> str:
+    t = (int(m.group(1)) * 3600 + int(m.group(2)) * 60 + int(m.group(3))
+         + int(m.group(4)) / 1000 + offset)
+    return _format_srt_time(t)
+
+
+def merge_srt(srt_entries, out_path: Path) -> Path:
+    """
+    Fusionne des SRT par chunk en un seul fichier : les timestamps sont
+    décalés du début cumulé de chaque chunk et les cues renumérotées.
+    srt_entries : liste de (offset_en_secondes, Path), dans l'ordre.
+    """
+    cue = 0
+    out = []
+    for offset, srt_file in srt_entries:
+        # Analyse positionnelle : une ligne de chiffres n'est un numéro de
+        # cue qu'en tête de bloc (début de fichier ou après une ligne
+        # vide) — un sous-titre dont le texte est "42" ou "2024" reste
+        # intact.
+        at_block_start = True
+        for line in fast_read_text(srt_file).splitlines():
+            s = line.strip()
+            if not s:
+                out.append("")
+                at_block_start = True
+                continue
+            if at_block_start and s.isdigit():
+                cue += 1
+                out.append(str(cue))
+            elif "-->" in s:
+                out.append(_SRT_TIME_RE.sub(lambda m: _shift_srt_time(m, offset), line))
+            else:
+                out.append(line)
+            at_block_start = False
+        if out and out[-1] != "":
+            out.append("")
+    out_path.write_text("\n".join(out), encoding="utf-8")
+    return out_path
+
+
+def merge_json(json_entries, out_path: Path) -> Path:
+    """
+    Concatène les JSON par chunk en décalant les horodatages. Gère les
+    deux schémas rencontrés : "transcription" (whisper-cli -oj, offsets
+    en ms + timestamps texte) et "segments" (whisper-server verbose_json,
+    start/end en secondes).
+    """
+    merged = None
+    for offset, json_file in json_entries:
+        data = json.loads(fast_read_text(json_file))
+        off_ms = int(round(offset * 1000))
+
+        segs = data.get("transcription") or []
+        for seg in segs:
+            offs = seg.get("offsets")
+            if isinstance(offs, dict):
+                for k in ("from", "to"):
+                    if isinstance(offs.get(k), int):
+                        offs[k] += off_ms
+            ts = seg.get("timestamps")
+            if isinstance(ts, dict):
+                for k in ("from", "to"):
+                    if isinstance(ts.get(k), str):
+                        ts[k] = _SRT_TIME_RE.sub(lambda m: _shift_srt_time(m, offset), ts[k])
+
+        vsegs = data.get("segments") or []
+        for seg in vsegs:
+            for k in ("start", "end"):
+                if isinstance(seg.get(k), (int, float)):
+                    seg[k] += offset
+
+        if merged is None:
+            merged = data
+        else:
+            if segs:
+                merged.setdefault("transcription", []).extend(segs)
+            if vsegs:
+                merged.setdefault("segments", []).extend(vsegs)
+
+    out_path.write_text(json.dumps(merged, ensure_ascii=False, indent=2), encoding="utf-8")
+    return out_path
+
+
+def fast_read_text(path: Path) -> str:
+    """
+    Lit un fichier texte en entier. Au-delà de 64 Kio on passe par mmap :
+    le cache de pages du noyau sert les octets sans chaîne read() ni copie
+    intermédiaire, et on ne décode l'UTF-8 qu'une seule fois. En dessous,
+    le coût d'installation du mapping domine, un read() classique suffit.
+    """
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size < 64 * 1024:
+            data = f.read()
+        else:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+                data = m[:]
+    return data.decode("utf-8", "ignore")
+
+
+def transcript_cache_key(audio_file: Path, language: str, n_procs: int = 1) -> str:
+    """
+    Empreinte (audio, modèle, langue, n_procs) d'une transcription :
+    whisper est déterministe pour ces entrées, donc la même empreinte
+    donne la même sortie et on peut resservir un résultat déjà calculé.
+    n_procs en fait partie car -p > 1 (mode rapide) peut changer le texte
+    aux jonctions internes.
+    """
+    h = hashlib.sha256()
+    with open(audio_file, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(block)
+    h.update(str(MODEL_PATH.stat().st_size).encode())
+    h.update((language or "").strip().encode())
+    h.update(str(n_procs).encode())
+    return h.hexdigest()
+
+
+def run_whisper(input_file: Path, language: str, make_srt: bool, make_json: bool, run_dir: Path, fast_mode: bool = False, make_pdf: bool = False, progress=None):
+    """
+    Générateur : yield ("partial", texte_cumulé) à chaque chunk terminé,
+    puis ("done", (texte, txt_files, srt_files, json_files, run_dir,
+    durée, pdf_future)) une fois tout réassemblé. run_dir est créé par
+    l'appelant ; pdf_future (ou None) est à rejoindre par l'appelant.
+    """
+    if progress is not None and not isinstance(progress, RateLimitedProgress):
+        progress = RateLimitedProgress(progress)
 
     # Logs "live" sur le terminal
     log(f"Extraction audio : {input_file}")
 
-    # 1) On extrait une piste audio propre (wav 16 kHz mono)
-    if progress:
-        progress(0.05, desc="Extraction audio...")
-    audio_path = extract_audio_if_needed(input_file, run_dir)
+    max_chunk_sec = 2 * 3600
 
-    # 2) On regarde la durée & on découpe si très long (ex: > 2h)
-    duration = get_media_duration_seconds(audio_path)
+    # 1) On regarde la durée du média source
+    duration = get_media_duration_seconds(input_file)
     log(f"Durée détectée : {duration/60:.1f} min")
 
-    chunks = split_long_audio(audio_path, run_dir, max_chunk_sec=2 * 3600)
+    # Cas mono-chunk : on fusionne extraction + transcription via un pipe
+    # (ffmpeg -f wav - | whisper-cli -f -), aucun audio.wav intermédiaire
+    # sur le disque. Le chemin multi-chunk garde des WAV sur disque car
+    # le découpage -ss/-t a besoin de seeker dans le fichier.
+    stream_input = 0 < duration <= max_chunk_sec and whisper_supports_stdin()
+
+    if stream_input:
+        chunks = [input_file]
+    else:
+        # 2) Extraction d'une piste audio propre (wav 16 kHz mono),
+        #    durée mesurée dans la même passe ffmpeg
+        if progress:
+            progress(0.05, desc="Extraction audio...")
+        audio_path, extracted_duration = extract_and_probe(input_file, run_dir)
+        duration = extracted_duration or duration
+
+        # Pour les très longs fichiers, on préfère couper sur des silences
+        # (chunks ~10 min auto-contenus) plutôt qu'à 2h pile, quitte à
+        # retomber sur le découpage fixe si aucun silence n'est détecté.
+        chunks = None
+        if duration > max_chunk_sec:
+            chunks = split_on_silence(audio_path, run_dir, target_sec=600)
+        if chunks is None:
+            chunks = split_long_audio(audio_path, run_dir, max_chunk_sec=max_chunk_sec)
+
     n_chunks = len(chunks)
     log(f"Découpage en {n_chunks} morceaux")
 
@@ -49,57 +407,294 @@ def run_whisper(input_file: Path, language: str, make_srt: bool, make_json: bool
     srt_files = []
     json_files = []
 
-    for idx, chunk in enumerate(chunks):
+    # Pool de workers : P process whisper-cli en parallèle, chacun avec T threads,
+    # de sorte que P·T ≈ nombre de cœurs physiques. CHUNK_WORKERS est un
+    # réglage opérateur : une valeur illisible est ignorée, pas fatale.
+    try:
+        n_workers = int(os.environ.get("CHUNK_WORKERS", "0"))
+    except ValueError:
+        log(f"CHUNK_WORKERS invalide ({os.environ.get('CHUNK_WORKERS')!r}), valeur ignorée")
+        n_workers = 0
+    n_workers = n_workers or min(n_chunks, 4)
+    n_workers = max(1, min(n_workers, n_chunks))
+    threads_per_worker = max(1, (os.cpu_count() or 4) // n_workers)
+
+    # Mode rapide : whisper_full_parallel (-p N) découpe l'audio en interne
+    # en partageant un seul buffer de poids — pas de N rechargements du modèle.
+    # On le réserve au cas mono-chunk (<2h) : au-delà, le pool de workers
+    # occupe déjà tous les cœurs.
+    n_procs = 1
+    if fast_mode and n_chunks == 1:
+        n_procs = min(4, os.cpu_count() or 4)
+        threads_per_worker = max(1, (os.cpu_count() or 4) // n_procs)
+        log(f"Mode rapide : -p {n_procs} -t {threads_per_worker}")
+
+    # File des slots d'affinité libres : pris au lancement d'un chunk,
+    # rendu à la fin. Dériver le slot de l'index (idx % n_workers) ne
+    # garantit rien entre chunks *en cours* dès que leurs durées
+    # diffèrent — deux process finiraient épinglés sur les mêmes cœurs
+    # pendant que d'autres cœurs restent vides.
+    affinity_slots = queue.Queue()
+    for _slot in range(n_workers):
+        affinity_slots.put(_slot)
+
+    def run_one_chunk(idx, chunk):
         base = run_dir / f"transcript_{idx:03d}"
 
         log(f"Traitement chunk {idx+1}/{n_chunks}")
 
-        cmd = [
-            str(WHISPER_BIN),
-            "-m", str(MODEL_PATH),
-            "-f", str(chunk),
-            "-otxt",
-            "-of", str(base),
-        ]
-
-        if language and language.strip():
-            cmd += ["-l", language.strip()]
-
-        if make_srt:
-            cmd += ["-osrt"]
-
-        if make_json:
-            cmd += ["-oj"]
-
-        if progress:
-            ratio = (idx / max(n_chunks, 1))
-            progress(0.1 + 0.8 * ratio, desc=f"Transcription chunk {idx+1}/{n_chunks}...")
+        # Cache par empreinte de contenu : si ce chunk a déjà été transcrit
+        # avec le même modèle et la même langue, on resservit le résultat
+        # au lieu de relancer l'inférence (~0.7x temps réel).
+        cache_dir = None
+        try:
+            key = transcript_cache_key(chunk, language, n_procs)
+            cache_dir = CACHE_DIR / key[:2] / key
+        except OSError:
+            pass
+
+        wanted = [".txt"] + ([".srt"] if make_srt else []) + ([".json"] if make_json else [])
+        if cache_dir is not None and all((cache_dir / f"transcript{ext}").exists() for ext in wanted):
+            # On ne matérialise que les artefacts demandés : un SRT/JSON
+            # en cache mais décoché ne doit pas réapparaître dans l'UI.
+            for ext in wanted:
+                src = cache_dir / f"transcript{ext}"
+                try:
+                    os.symlink(src, base.with_suffix(ext))
+                except OSError:
+                    shutil.copyfile(src, base.with_suffix(ext))
+            log(f"Chunk {idx+1}/{n_chunks} servi depuis le cache")
+            return idx, base
+
+        # Le serveur résident évite de recharger le modèle, mais il
+        # sérialise toutes les inférences derrière un mutex : on ne
+        # l'emploie que s'il n'y a de toute façon qu'un seul chunk (ou un
+        # seul worker), sinon on garde les whisper-cli parallèles du pool.
+        # Le chemin streamé (pipe ffmpeg) n'a pas de WAV à uploader : il
+        # garde whisper-cli, qui ne charge le modèle qu'une fois de toute façon.
+        used_server = False
+        if not stream_input and (n_chunks == 1 or n_workers == 1):
+            port = ensure_whisper_server()
+            if port is not None:
+                try:
+                    transcribe_via_server(port, chunk, base, language, make_srt, make_json)
+                    used_server = True
+                except Exception as e:
+                    log(f"whisper-server indisponible ({e}), repli sur whisper-cli")
+
+        if not used_server:
+            # Chaque whisper-cli actif reçoit un jeu de cœurs disjoint : pas
+            # de migration OS ni de ping-pong de lignes de cache entre deux
+            # process concurrents. (Linux : sched_setaffinity ; no-op ailleurs.)
+            preexec = None
+            slot = None
+            if n_workers > 1 and hasattr(os, "sched_setaffinity"):
+                slot = affinity_slots.get()
+                n_cpus = os.cpu_count() or 1
+                core_set = {(slot * threads_per_worker + i) % n_cpus for i in range(threads_per_worker)}
+                preexec = lambda: os.sched_setaffinity(0, core_set)
+
+            try:
+                cmd = [
+                    str(WHISPER_BIN),
+                    "-m", str(MODEL_PATH),
+                    "-f", "-" if stream_input else str(chunk),
+                    "-t", str(threads_per_worker),
+                    "-otxt",
+                    "-of", str(base),
+                ]
+
+                if n_procs > 1:
+                    cmd += ["-p", str(n_procs)]
+
+                if language and language.strip():
+                    cmd += ["-l", language.strip()]
+
+                if make_srt:
+                    cmd += ["-osrt"]
+
+                if make_json:
+                    cmd += ["-oj"]
+
+                # En mono-chunk, on laisse whisper-cli annoncer sa progression
+                # et on la relaie telle quelle à la barre Gradio.
+                if progress and n_chunks == 1:
+                    cmd += ["--print-progress"]
+
+                def run_streamed(cmd, stdin=None):
+                    # stderr est consommé ligne à ligne : rien n'est accumulé en
+                    # mémoire, on ne garde qu'une queue des dernières lignes
+                    # pour le rapport d'erreur.
+                    proc = subprocess.Popen(
+                        cmd,
+                        stdin=stdin,
+                        stdout=subprocess.DEVNULL,
+                        stderr=subprocess.PIPE,
+                        bufsize=1,
+                        text=True,
+                        preexec_fn=preexec,
+                    )
+                    tail = deque(maxlen=400)
+                    for line in proc.stderr:
+                        tail.append(line)
+                        if progress and n_chunks == 1:
+                            m = _PROGRESS_RE.search(line)
+                            if m:
+                                progress(0.1 + 0.8 * min(int(m.group(1)), 100) / 100,
+                                         desc="Transcription...")
+                    proc.wait()
+                    return proc.returncode, "".join(tail)
+
+                if stream_input:
+                    # ffmpeg écrit le WAV 16 kHz mono directement sur le pipe,
+                    # whisper-cli le lit sur stdin : zéro octet sur le disque.
+                    ff_cmd = [
+                        "ffmpeg",
+                        "-v", "error",
+                        "-i", str(chunk),
+                        "-vn",
+                        "-acodec", "pcm_s16le",
+                        "-ar", "16000",
+                        "-ac", "1",
+                        "-f", "wav",
+                        "-",
+                    ]
+                    ff = subprocess.Popen(ff_cmd, stdout=subprocess.PIPE)
+                    returncode, err = run_streamed(cmd, stdin=ff.stdout)
+                    # On ferme notre copie du pipe pour que ffmpeg voie l'EOF/SIGPIPE
+                    ff.stdout.close()
+                    ff.wait()
+                    # Si whisper-cli meurt sans vider stdin, ffmpeg finit en
+                    # SIGPIPE : c'est le diagnostic whisper (dans err) qui
+                    # compte, on ne signale ffmpeg que si whisper a réussi.
+                    if returncode == 0 and ff.returncode != 0:
+                        raise RuntimeError(f"Erreur ffmpeg (extraction en flux, code {ff.returncode})")
+                else:
+                    returncode, err = run_streamed(cmd)
+
+                if returncode != 0:
+                    raise RuntimeError(f"Erreur WhisperCLI (chunk {idx+1}):\n{err}")
+            finally:
+                if slot is not None:
+                    affinity_slots.put(slot)
+
+        # Alimentation du cache, de façon atomique (tmp dir + os.replace)
+        if cache_dir is not None:
+            try:
+                tmp_dir = cache_dir.parent / f"{cache_dir.name}.tmp{os.getpid()}_{idx}"
+                tmp_dir.mkdir(parents=True, exist_ok=True)
+                for ext in (".txt", ".srt", ".json"):
+                    out_file = base.with_suffix(ext)
+                    if out_file.exists():
+                        shutil.copyfile(out_file, tmp_dir / f"transcript{ext}")
+                if cache_dir.exists():
+                    shutil.rmtree(cache_dir, ignore_errors=True)
+                os.replace(tmp_dir, cache_dir)
+            except OSError:
+                pass
+
+        return idx, base
+
+    # subprocess.run relâche le GIL : un ThreadPoolExecutor suffit pour
+    # faire tourner les whisper-cli en parallèle.
+    bases = {}
+    partial_texts = {}
+    n_done = 0
+    with ThreadPoolExecutor(max_workers=n_workers) as pool:
+        futures = [pool.submit(run_one_chunk, idx, chunk) for idx, chunk in enumerate(chunks)]
+        for fut in as_completed(futures):
+            idx, base = fut.result()
+            bases[idx] = base
+            n_done += 1
+            # La progression se met à jour depuis le thread principal,
+            # en fonction du nombre de chunks terminés.
+            if progress:
+                progress(0.1 + 0.8 * (n_done / n_chunks), desc=f"Transcription chunk {n_done}/{n_chunks}...")
+
+            # Texte partiel vers l'UI dès qu'un chunk est prêt : l'utilisateur
+            # voit la transcription avancer au lieu d'attendre la fin.
+            try:
+                partial_texts[idx] = fast_read_text(base.with_suffix(".txt"))
+            except FileNotFoundError:
+                pass
+            yield "partial", "\n\n".join(partial_texts[i] for i in sorted(partial_texts))
+
+    def collect_artifacts(base):
+        # Lecture EAFP : un seul open par artefact au lieu de exists() + read
+        txt_file = base.with_suffix(".txt")
+        try:
+            text = fast_read_text(txt_file)
+        except FileNotFoundError:
+            txt_file, text = None, None
+        srt_file = base.with_suffix(".srt")
+        json_file = base.with_suffix(".json")
+        return (
+            txt_file,
+            text,
+            srt_file if srt_file.exists() else None,
+            json_file if json_file.exists() else None,
+        )
 
-        res = subprocess.run(cmd, capture_output=True, text=True)
-        if res.returncode != 0:
-            err = res.stderr or res.stdout
-            raise RuntimeError(f"Erreur WhisperCLI (chunk {idx+1}):\n{err}")
+    # Ramassage groupé des petits fichiers de sortie : les syscalls
+    # open/read/close des N×3 artefacts partent en un seul batch au lieu
+    # de 3 allers-retours séquentiels par chunk.
+    with ThreadPoolExecutor(max_workers=8) as read_pool:
+        collected = list(read_pool.map(collect_artifacts, (bases[i] for i in range(n_chunks))))
 
-        txt_file = base.with_suffix(".txt")
-        if txt_file.exists():
+    # Réassemblage dans l'ordre des index avant concaténation
+    for txt_file, text, srt_file, json_file in collected:
+        if txt_file is not None:
             txt_files.append(txt_file)
-            full_text.append(txt_file.read_text(encoding="utf-8", errors="ignore"))
-
-        srt_file = base.with_suffix(".srt")
-        if srt_file.exists():
+            full_text.append(text)
+        if srt_file is not None:
             srt_files.append(srt_file)
-
-        json_file = base.with_suffix(".json")
-        if json_file.exists():
+        if json_file is not None:
             json_files.append(json_file)
 
-    # Concat simple du texte. (SRT & JSON restent chunkés pour l'instant)
+    # Concat simple du texte
     joined_text = "\n\n".join(full_text)
+
+    # Le PDF démarre dès que le texte assemblé existe : il se construit
+    # dans le pool de fond pendant les fusions SRT/JSON ci-dessous, puis
+    # pendant la finalisation côté transcribe(), qui rejoint la future.
+    pdf_future = None
+    if make_pdf:
+        pdf_future = _bg_pool.submit(make_pdf_from_text, joined_text, run_dir)
+
+    # Fusion des SRT/JSON chunkés en un seul fichier téléchargeable :
+    # sans ça, l'utilisateur ne récupérait que le chunk 0. Les deux
+    # fusions tournent en parallèle dans le pool de fond.
+    if n_chunks > 1:
+        offsets = []
+        t0 = 0.0
+        for chunk in chunks:
+            offsets.append(t0)
+            t0 += get_media_duration_seconds(chunk)
+
+        srt_entries = [(offsets[i], srt) for i, (_, _, srt, _) in enumerate(collected) if srt is not None]
+        json_entries = [(offsets[i], js) for i, (_, _, _, js) in enumerate(collected) if js is not None]
+
+        srt_fut = _bg_pool.submit(merge_srt, srt_entries, run_dir / "merged.srt") if len(srt_entries) > 1 else None
+        json_fut = _bg_pool.submit(merge_json, json_entries, run_dir / "merged.json") if len(json_entries) > 1 else None
+        if srt_fut is not None:
+            srt_files = [srt_fut.result()]
+        if json_fut is not None:
+            json_files = [json_fut.result()]
+
     if progress:
         progress(0.95, desc="Finalisation...")
 
     # On garde le répertoire pour pouvoir packer tout ça proprement
-    return joined_text, txt_files, srt_files, json_files, run_dir, duration
+    yield "done", (joined_text, txt_files, srt_files, json_files, run_dir, duration, pdf_future)
+
+
+# Lignes "progress = NN%" émises par whisper-cli avec --print-progress
+_PROGRESS_RE = re.compile(r"progress\s*=\s*(\d+)%")
+
+# Wrap à ~100 caractères en une seule passe regex (un match par ligne),
+# bien moins cher que textwrap.wrap appelé paragraphe par paragraphe.
+# La 2e alternative coupe en force les mots de plus de 100 caractères (URLs).
+_WRAP_RE = re.compile(r"(.{1,100})(?:\s+|$)|(.{100})", re.DOTALL)
 
 
 def make_pdf_from_text(text: str, run_dir: Path) -> Path:
@@ -109,16 +704,101 @@ def make_pdf_from_text(text: str, run_dir: Path) -> Path:
     - police Roboto (TTF) si dispo, sinon fallback Helvetica
     - gestion des longues lignes
     """
+    if HAVE_REPORTLAB:
+        return _make_pdf_reportlab(text, run_dir)
+    return _make_pdf_fpdf(text, run_dir)
+
+
+# Polices reportlab : enregistrées une seule fois pour tout le process
+_reportlab_fonts = None
+
+
+def _register_reportlab_fonts():
+    global _reportlab_fonts
+    if _reportlab_fonts is None:
+        font_dir = Path(__file__).parent / "fonts"
+        regular, bold = "Helvetica", "Helvetica-Bold"
+        try:
+            pdfmetrics.registerFont(TTFont("Roboto", str(font_dir / "Roboto-Regular.ttf")))
+            regular = "Roboto"
+        except Exception:
+            pass
+        try:
+            pdfmetrics.registerFont(TTFont("Roboto-Bold", str(font_dir / "Roboto-Bold.ttf")))
+            bold = "Roboto-Bold"
+        except Exception:
+            pass
+        _reportlab_fonts = (regular, bold)
+    return _reportlab_fonts
+
+
+def _make_pdf_reportlab(text: str, run_dir: Path) -> Path:
     pdf_path = run_dir / "transcript.pdf"
+    regular, bold = _register_reportlab_fonts()
+
+    doc = SimpleDocTemplate(
+        str(pdf_path),
+        pagesize=A4,
+        leftMargin=15 * mm,
+        rightMargin=15 * mm,
+        topMargin=20 * mm,
+        bottomMargin=20 * mm,
+    )
+    title_style = ParagraphStyle("title", fontName=bold, fontSize=14, leading=18)
+    body_style = ParagraphStyle("body", fontName=regular, fontSize=11, leading=14)
+
+    story = []
 
+    logo_path = Path(__file__).parent / "logo.png"
+    if logo_path.exists():
+        try:
+            iw, ih = ImageReader(str(logo_path)).getSize()
+            story.append(Image(str(logo_path), width=30 * mm, height=30 * mm * ih / iw))
+            story.append(Spacer(1, 6))
+        except Exception:
+            pass
+
+    story.append(Paragraph("Transcription Whisper", title_style))
+    story.append(Spacer(1, 10))
+
+    # Un Paragraph par paragraphe : le wrap est fait par reportlab en une
+    # passe, pas besoin de pré-découper les lignes côté Python.
+    for paragraph in text.split("\n"):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            story.append(Spacer(1, 4))
+            continue
+        story.append(Paragraph(_xml_escape(paragraph), body_style))
+
+    doc.build(story)
+    return pdf_path
+
+
+# Polices TTF déjà parsées : add_font(uni=True) reparse le fichier et
+# reconstruit la CMap à chaque instance FPDF — coût dominant sur les
+# petits documents. On ne paie ce parse qu'une fois par process.
+_FONT_CACHE = {}
+
+
+def make_fpdf() -> FPDF:
+    """FPDF avec les polices maison : parse des TTF à la première instance,
+    réinjection des métriques en cache pour les suivantes."""
     pdf = FPDF()
-    # marges raisonnables
-    pdf.set_margins(left=15, top=20, right=15)
-    pdf.set_auto_page_break(auto=True, margin=20)
-    pdf.add_page()
 
-    base_dir = Path(__file__).parent
-    font_dir = base_dir / "fonts"
+    if _FONT_CACHE:
+        try:
+            # Copie profonde : FPDF annote l'état par document (listes de
+            # sous-ensembles de glyphes, largeurs...) jusque dans les
+            # structures imbriquées des entrées — rien ne doit être
+            # partagé entre deux PDF, surtout construits sur _bg_pool.
+            pdf.fonts.update(copy.deepcopy(_FONT_CACHE["fonts"]))
+            if _FONT_CACHE.get("font_files") and hasattr(pdf, "font_files"):
+                pdf.font_files.update(copy.deepcopy(_FONT_CACHE["font_files"]))
+            return pdf
+        except Exception:
+            pass
+
+    font_dir = Path(__file__).parent / "fonts"
 
     # Ajout des polices TTF (en essayant d'être tolérant si un fichier manque)
     try:
@@ -134,6 +814,29 @@ def make_pdf_from_text(text: str, run_dir: Path) -> Path:
     except Exception:
         pass
 
+    try:
+        # Snapshot profond pris avant toute écriture : le cache reste une
+        # copie vierge, jamais touchée par les documents qui s'en servent.
+        _FONT_CACHE["fonts"] = copy.deepcopy(pdf.fonts)
+        if hasattr(pdf, "font_files"):
+            _FONT_CACHE["font_files"] = copy.deepcopy(pdf.font_files)
+    except Exception:
+        pass
+
+    return pdf
+
+
+def _make_pdf_fpdf(text: str, run_dir: Path) -> Path:
+    pdf_path = run_dir / "transcript.pdf"
+
+    pdf = make_fpdf()
+    # marges raisonnables
+    pdf.set_margins(left=15, top=20, right=15)
+    pdf.set_auto_page_break(auto=True, margin=20)
+    pdf.add_page()
+
+    base_dir = Path(__file__).parent
+
     # Logo si présent
     logo_path = base_dir / "logo.png"
     if logo_path.exists():
@@ -170,12 +873,10 @@ def make_pdf_from_text(text: str, run_dir: Path) -> Path:
             continue
 
         # On "wrap" le texte pour éviter les lignes infinies
-        wrapped_lines = textwrap.wrap(
-            paragraph,
-            width=100,  # nombre de caractères approx
-            break_long_words=True,
-            break_on_hyphens=False,
-        )
+        if len(paragraph) <= 100:
+            wrapped_lines = [paragraph]
+        else:
+            wrapped_lines = [m.group(1) or m.group(2) for m in _WRAP_RE.finditer(paragraph)]
         for line in wrapped_lines:
             pdf.multi_cell(effective_width, 6, line)
         pdf.ln(2)
@@ -184,37 +885,67 @@ def make_pdf_from_text(text: str, run_dir: Path) -> Path:
     return pdf_path
 
 
-def download_youtube_audio(url: str, run_id: str):
-    run_dir = OUTPUT_DIR / run_id
-    run_dir.mkdir(exist_ok=True)
-    outtmpl = str(run_dir / "yt_audio.%(ext)s")
+def download_youtube_audio(url: str, run_dir: Path):
+    YT_CACHE_DIR.mkdir(exist_ok=True)
 
     ydl_opts = {
         "format": "bestaudio/best",
-        "outtmpl": outtmpl,
         "noplaylist": True,
         "quiet": True,
         "no_warnings": True,
     }
 
+    # Sondage métadonnées seul (pas de téléchargement) pour obtenir l'id :
+    # la même vidéo redemandée est servie depuis le cache, zéro réseau.
+    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+        info = ydl.extract_info(url, download=False)
+        video_id = info.get("id")
+
+    if video_id:
+        # On écarte les artefacts d'un téléchargement interrompu
+        # (<id>.webm.part, <id>.ytdl...) : seul le fichier final, renommé
+        # atomiquement par yt-dlp une fois complet, compte comme hit.
+        cached = sorted(
+            p for p in YT_CACHE_DIR.glob(f"{video_id}.*")
+            if p.suffix not in (".part", ".ytdl", ".temp", ".download")
+        )
+        if cached:
+            log(f"YouTube : audio déjà en cache ({video_id})")
+            return cached[0]
+
+    outtmpl = str((YT_CACHE_DIR if video_id else run_dir) / "%(id)s.%(ext)s")
+    ydl_opts["outtmpl"] = outtmpl
+
     with yt_dlp.YoutubeDL(ydl_opts) as ydl:
         info = ydl.extract_info(url, download=True)
         downloaded = ydl.prepare_filename(info)
     return Path(downloaded)
 
 
-def transcribe(media_file, youtube_url, language, make_srt, make_json, make_pdf, history, progress=gr.Progress()):
+def transcribe(media_file, youtube_url, language, make_srt, make_json, make_pdf, fast_mode, history, progress=gr.Progress()):
+    # Générateur : Gradio pousse chaque yield vers l'UI, donc le texte
+    # partiel apparaît chunk par chunk au lieu d'un bloc à la toute fin.
     if not WHISPER_BIN.exists():
-        return ("Binaire introuvable : "
-                f"{WHISPER_BIN}"), None, None, None, None, history, ""
+        yield ("Binaire introuvable : "
+               f"{WHISPER_BIN}"), None, None, None, None, history, ""
+        return
     if not MODEL_PATH.exists():
-        return ("Modèle introuvable : "
-                f"{MODEL_PATH}"), None, None, None, None, history, ""
+        yield ("Modèle introuvable : "
+               f"{MODEL_PATH}"), None, None, None, None, history, ""
+        return
 
     run_id = datetime.now().strftime("%Y%m%d_%H%M%S")
     source_desc = ""
     input_path = None
 
+    # Le répertoire du run est créé ici une fois pour toutes : les helpers
+    # le reçoivent en paramètre au lieu de refaire chacun stat+mkdir.
+    run_dir = OUTPUT_DIR / run_id
+    run_dir.mkdir(parents=True, exist_ok=True)
+
+    # Coalescence des mises à jour de la barre (≥ ~100 ms entre deux envois)
+    progress = RateLimitedProgress(progress)
+
     try:
         log("Début transcription")
         progress(0.01, desc="Préparation...")
@@ -223,24 +954,38 @@ def transcribe(media_file, youtube_url, language, make_srt, make_json, make_pdf,
             source_desc = f"YouTube: {youtube_url.strip()}"
             log(f"Source : {source_desc}")
             progress(0.05, desc="Téléchargement YouTube...")
-            input_path = download_youtube_audio(youtube_url.strip(), run_id)
+            input_path = download_youtube_audio(youtube_url.strip(), run_dir)
             log("Téléchargement YouTube terminé")
         elif media_file:
             source_desc = f"Fichier upload: {Path(media_file).name}"
             input_path = Path(media_file)
             log(f"Source : {source_desc}")
         else:
-            return "Aucun fichier ni URL fournie.", None, None, None, None, history, ""
-
-        # On lance Whisper (avec extraction audio, découpage, etc.)
-        text, txt_files, srt_files, json_files, run_dir, duration = run_whisper(
+            yield "Aucun fichier ni URL fournie.", None, None, None, None, history, ""
+            return
+
+        # On lance Whisper (avec extraction audio, découpage, etc.) ;
+        # les yields intermédiaires remontent le texte partiel vers l'UI.
+        result = None
+        history_md_now = "\n".join(history or [])
+        for kind, payload in run_whisper(
             input_file=input_path,
             language=language,
             make_srt=make_srt,
             make_json=make_json,
-            run_id=run_id,
+            run_dir=run_dir,
+            fast_mode=fast_mode,
+            make_pdf=make_pdf,
             progress=progress,
-        )
+        ):
+            if kind == "partial":
+                yield payload, None, None, None, None, history, history_md_now
+            else:
+                result = payload
+
+        # pdf_future a été lancée par run_whisper dès le texte assemblé ;
+        # elle est rejointe plus bas, après la finalisation.
+        text, txt_files, srt_files, json_files, run_dir, duration, pdf_future = result
 
         # Estimation simple : small sur N100 ≈ 0.3x à 1x temps réel
         if duration > 0:
@@ -252,13 +997,14 @@ def transcribe(media_file, youtube_url, language, make_srt, make_json, make_pdf,
         else:
             estimation_text = ""
 
-        pdf_file = None
-        if make_pdf:
-            pdf_file = make_pdf_from_text(text, run_dir)
-            log("PDF généré")
-
-        # On ne renvoie qu’un TXT/SRT/JSON/PDF principal (le premier chunk) pour le téléchargement direct
+        # Fichiers proposés au téléchargement : SRT/JSON ont déjà été
+        # fusionnés par run_whisper en multi-chunk ; pour le TXT on
+        # matérialise le texte assemblé, sinon l'utilisateur ne
+        # récupérerait que le chunk 0.
         txt_file_out = txt_files[0] if txt_files else None
+        if len(txt_files) > 1:
+            txt_file_out = run_dir / "merged.txt"
+            txt_file_out.write_text(text, encoding="utf-8")
         srt_file_out = srt_files[0] if srt_files else None
         json_file_out = json_files[0] if json_files else None
 
@@ -267,43 +1013,95 @@ def transcribe(media_file, youtube_url, language, make_srt, make_json, make_pdf,
         history = history[:10]
         history_md = "\n".join(history)
 
+        # On rejoint le PDF avant de rendre la main
+        pdf_file = None
+        if pdf_future is not None:
+            pdf_file = pdf_future.result()
+            log("PDF généré")
+
         progress(1.0, desc="Terminé ✅")
         log("Transcription terminée")
 
-        return estimation_text + (text or "(Transcription vide)"), \
-               str(txt_file_out) if txt_file_out else None, \
-               str(srt_file_out) if srt_file_out else None, \
-               str(pdf_file) if pdf_file else None, \
-               str(json_file_out) if json_file_out else None, \
-               history, history_md
+        yield estimation_text + (text or "(Transcription vide)"), \
+              str(txt_file_out) if txt_file_out else None, \
+              str(srt_file_out) if srt_file_out else None, \
+              str(pdf_file) if pdf_file else None, \
+              str(json_file_out) if json_file_out else None, \
+              history, history_md
 
     except Exception as e:
         err = f"Erreur pendant le traitement : {e}"
         log(err)
-        return err, None, None, None, None, history, ""
+        yield err, None, None, None, None, history, ""
+
+
+# Cache des durées déjà mesurées, pour ne pas re-sonder le même fichier
+# (run_whisper puis split_long_audio interrogent le même WAV extrait).
+_duration_cache = {}
 
 
 def get_media_duration_seconds(path: Path) -> float:
-    """Retourne la durée en secondes via ffprobe."""
-    cmd = [
-        "ffprobe",
-        "-v", "error",
-        "-show_entries", "format=duration",
-        "-of", "default=nw=1:nk=1",
-        str(path),
-    ]
+    """Retourne la durée en secondes (header WAV via soundfile, sinon ffprobe)."""
+    path = Path(path)
     try:
-        out = subprocess.check_output(cmd, stderr=subprocess.STDOUT).decode().strip()
-        return float(out)
-    except Exception:
-        return 0.0
+        st = path.stat()
+        cache_key = (str(path), st.st_mtime, st.st_size)
+    except OSError:
+        cache_key = None
+
+    if cache_key is not None and cache_key in _duration_cache:
+        return _duration_cache[cache_key]
+
+    duration = 0.0
+
+    # Pour un WAV, la durée est frames/samplerate dans le header RIFF :
+    # simple lecture d'en-tête, pas de décodage ni de fork.
+    if sf is not None and path.suffix.lower() == ".wav":
+        try:
+            info = sf.info(str(path))
+            duration = info.frames / info.samplerate
+        except Exception:
+            duration = 0.0
+
+    if duration <= 0:
+        cmd = [
+            "ffprobe",
+            "-v", "error",
+            "-show_entries", "format=duration",
+            "-of", "default=nw=1:nk=1",
+            str(path),
+        ]
+        try:
+            out = subprocess.check_output(cmd, stderr=subprocess.STDOUT).decode().strip()
+            duration = float(out)
+        except Exception:
+            duration = 0.0
+
+    if cache_key is not None:
+        _duration_cache[cache_key] = duration
+    return duration
 
 
-def extract_audio_if_needed(path: Path, run_dir: Path) -> Path:
+def extract_and_probe(path: Path, run_dir: Path):
     """
-    Si c'est une vidéo, on extrait une piste audio propre.
-    Pour simplifier, on convertit tout en wav mono 16 kHz.
+    Si c'est une vidéo, on extrait une piste audio propre (wav mono 16 kHz)
+    et on mesure la durée dans la même passe : ffmpeg écrit out_time_ms sur
+    son flux -progress pendant la conversion, pas besoin d'un fork ffprobe
+    séparé. Retourne (audio_path, durée_en_secondes).
     """
+    path = Path(path)
+
+    # Déjà un WAV PCM 16 kHz mono ? Inutile de payer un décode+réencode
+    # complet : un coup d'œil au header suffit et on renvoie le fichier tel quel.
+    if sf is not None and path.suffix.lower() == ".wav":
+        try:
+            info = sf.info(str(path))
+            if info.samplerate == 16000 and info.channels == 1 and info.subtype == "PCM_16":
+                log("Audio déjà en WAV 16 kHz mono, extraction sautée")
+                return path, get_media_duration_seconds(path)
+        except Exception:
+            pass
+
     audio_path = run_dir / "audio.wav"
     cmd = [
         "ffmpeg",
@@ -313,10 +1111,102 @@ def extract_audio_if_needed(path: Path, run_dir: Path) -> Path:
         "-acodec", "pcm_s16le",
         "-ar", "16000",
         "-ac", "1",
+        "-progress", "pipe:1",
         str(audio_path),
     ]
+    res = subprocess.run(cmd, check=True, capture_output=True, text=True)
+
+    # Le dernier out_time_ms (en microsecondes malgré le nom) donne la
+    # durée totale écrite.
+    duration = 0.0
+    for line in res.stdout.splitlines():
+        if line.startswith("out_time_ms="):
+            try:
+                duration = int(line.split("=", 1)[1]) / 1e6
+            except ValueError:
+                pass
+
+    if duration > 0:
+        # On pré-remplit le cache de durées : les découpes qui suivent
+        # re-sondent le même WAV et tomberont dessus gratuitement.
+        try:
+            st = audio_path.stat()
+            _duration_cache[(str(audio_path), st.st_mtime, st.st_size)] = duration
+        except OSError:
+            pass
+    else:
+        duration = get_media_duration_seconds(audio_path)
+
+    return audio_path, duration
+
+
+def split_on_silence(audio_path: Path, run_dir: Path, target_sec: int = 600):
+    """
+    Découpe l'audio sur des silences naturels (ffmpeg silencedetect) en
+    visant des chunks d'environ target_sec : chaque chunk est auto-contenu,
+    pas de mot coupé en deux à la jonction, et les petits chunks se
+    parallélisent mieux dans le pool.
+    Retourne None si aucun silence exploitable (on retombe alors sur le
+    découpage fixe).
+    """
+    duration = get_media_duration_seconds(audio_path)
+    if duration <= 0:
+        return None
+
+    # Passe d'analyse : silencedetect écrit silence_start/silence_end sur stderr
+    cmd = [
+        "ffmpeg",
+        "-i", str(audio_path),
+        "-af", "silencedetect=noise=-30dB:d=0.5",
+        "-f", "null",
+        "-",
+    ]
+    res = subprocess.run(cmd, capture_output=True, text=True)
+
+    silences = []
+    sil_start = None
+    for line in (res.stderr or "").splitlines():
+        if "silence_start:" in line:
+            try:
+                sil_start = float(line.split("silence_start:")[1].split()[0])
+            except (IndexError, ValueError):
+                sil_start = None
+        elif "silence_end:" in line and sil_start is not None:
+            try:
+                sil_end = float(line.split("silence_end:")[1].split()[0])
+                silences.append((sil_start, sil_end))
+            except (IndexError, ValueError):
+                pass
+            sil_start = None
+
+    if not silences:
+        return None
+
+    # Greedy : on coupe au milieu du premier silence après chaque tranche
+    # de target_sec. Couper en plein silence rend le recouvrement inutile.
+    cut_points = []
+    next_cut = target_sec
+    for s, e in silences:
+        if s >= next_cut:
+            cut_points.append((s + e) / 2)
+            next_cut = s + target_sec
+
+    if not cut_points:
+        return None
+
+    # Une seule passe de découpe, comme pour le découpage fixe
+    cmd = [
+        "ffmpeg",
+        "-y",
+        "-i", str(audio_path),
+        "-f", "segment",
+        "-segment_times", ",".join(f"{c:.3f}" for c in cut_points),
+        "-c", "copy",
+        str(run_dir / "chunk_%03d.wav"),
+    ]
     subprocess.run(cmd, check=True)
-    return audio_path
+
+    return sorted(run_dir.glob("chunk_*.wav"))
 
 
 def split_long_audio(audio_path: Path, run_dir: Path, max_chunk_sec: int = 2 * 3600):
@@ -328,25 +1218,21 @@ def split_long_audio(audio_path: Path, run_dir: Path, max_chunk_sec: int = 2 * 3
     if duration <= max_chunk_sec or duration <= 0:
         return [audio_path]
 
-    n_chunks = math.ceil(duration / max_chunk_sec)
-    chunk_paths = []
-
-    for i in range(n_chunks):
-        start = i * max_chunk_sec
-        out_path = run_dir / f"chunk_{i:03d}.wav"
-        cmd = [
-            "ffmpeg",
-            "-y",
-            "-i", str(audio_path),
-            "-ss", str(start),
-            "-t", str(max_chunk_sec),
-            "-acodec", "copy",
-            str(out_path),
-        ]
-        subprocess.run(cmd, check=True)
-        chunk_paths.append(out_path)
+    # Le muxer "segment" produit tous les chunks en une seule passe
+    # (une lecture du fichier, un fork) au lieu d'un ffmpeg par chunk.
+    # Il s'arrête de lui-même à la fin de l'entrée.
+    cmd = [
+        "ffmpeg",
+        "-y",
+        "-i", str(audio_path),
+        "-f", "segment",
+        "-segment_time", str(max_chunk_sec),
+        "-c", "copy",
+        str(run_dir / "chunk_%03d.wav"),
+    ]
+    subprocess.run(cmd, check=True)
 
-    return chunk_paths
+    return sorted(run_dir.glob("chunk_*.wav"))
 
 
 # 🔥 Créer l’interface explicitement
@@ -368,6 +1254,10 @@ with demo:
             make_srt = gr.Checkbox(label="Générer un fichier SRT", value=True)
             make_json = gr.Checkbox(label="Générer un JSON", value=False)
             make_pdf = gr.Checkbox(label="Générer un PDF", value=True)
+            fast_mode = gr.Checkbox(
+                label="Mode rapide (-p : transcription parallèle, peut dégrader la précision aux jonctions)",
+                value=False,
+            )
 
         btn = gr.Button("🚀 Lancer la transcription")
 
@@ -385,7 +1275,7 @@ with demo:
 
     btn.click(
         fn=transcribe,
-        inputs=[media, yt, lang, make_srt, make_json, make_pdf, history_state],
+        inputs=[media, yt, lang, make_srt, make_json, make_pdf, fast_mode, history_state],
         outputs=[txt_out, txt_file_out, srt_file_out, pdf_file_out, json_file_out, history_state, history_md]
     )
 